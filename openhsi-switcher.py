@@ -6,15 +6,48 @@ A web service to manage other services like simple-web-controller, Jupyter, etc.
 import subprocess
 import json
 import os
+import bisect
+import csv
+import ctypes
+import ctypes.util
+import functools
+import io
+import itertools
+import math
+import operator
+import queue
 import psutil
+import re
+import struct
 import time
 from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from threading import Thread, Lock
-from flask import Flask, jsonify, request, render_template_string
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    request,
+    render_template_string,
+    stream_with_context,
+)
 
 # from flask_cors import CORS
 import logging
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 app = Flask(__name__)
 # CORS(app)  # Enable CORS for API access
 
@@ -22,8 +55,15 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Service configurations
-SERVICES = {
+# Service configuration, reloaded on change. The first of these files found next
+# to this script is used, YAML needs PyYAML to be installed.
+SERVICES_CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICES_CONFIG_NAMES = ("services.toml", "services.yaml", "services.yml")
+CONFIG_RELOAD_DELAY = 0.5  # Seconds to let editors finish writing before reloading
+CONFIG_POLL_INTERVAL = 5  # Seconds between checks when inotify is unavailable
+
+# Services used when no configuration file exists
+DEFAULT_SERVICES = {
     "webgui": {
         "name": "OpenHSI WebGUI",
         "systemd_unit": "simple-web-controller.service",
@@ -42,10 +82,20 @@ SERVICES = {
 
 # Resource monitoring configuration
 MONITOR_HISTORY_SIZE = 60  # Keep 60 data points (5 minutes at 5-second intervals)
+
+# Pressure stall information (PSI), read system-wide and per service cgroup
+PSI_ROOT = "/proc/pressure"
+CGROUP_ROOT = "/sys/fs/cgroup"  # cgroup v2 unified hierarchy
+PSI_RESOURCES = ("cpu", "memory", "io")
+PSI_KINDS = ("some", "full")
+# History keys holding the percentage of each tick spent stalled
+PSI_HISTORY_KEYS = [f"psi_{res}_{kind}" for res in PSI_RESOURCES for kind in PSI_KINDS]
+
 resource_history = defaultdict(
     lambda: {
         "cpu": deque(maxlen=MONITOR_HISTORY_SIZE),
         "memory": deque(maxlen=MONITOR_HISTORY_SIZE),
+        **{key: deque(maxlen=MONITOR_HISTORY_SIZE) for key in PSI_HISTORY_KEYS},
         "timestamps": deque(maxlen=MONITOR_HISTORY_SIZE),
     }
 )
@@ -58,9 +108,121 @@ system_history = {
     "disk": deque(maxlen=MONITOR_HISTORY_SIZE),
     "network_sent": deque(maxlen=MONITOR_HISTORY_SIZE),
     "network_recv": deque(maxlen=MONITOR_HISTORY_SIZE),
+    "disk_read": deque(maxlen=MONITOR_HISTORY_SIZE),
+    "disk_write": deque(maxlen=MONITOR_HISTORY_SIZE),
+    "data_free": deque(maxlen=MONITOR_HISTORY_SIZE),
+    **{key: deque(maxlen=MONITOR_HISTORY_SIZE) for key in PSI_HISTORY_KEYS},
     "timestamps": deque(maxlen=MONITOR_HISTORY_SIZE),
 }
 
+# Filesystem that holds captured datacubes, tracked for free space and time-to-full
+DATA_MOUNT = "/"
+# Time constant of the fill rate used for the time-to-full projection. Captures
+# write in bursts, so the projection is smoothed over hours rather than ticks.
+DATA_FILL_RATE_TAU = 3600
+
+# I/O counter configuration
+LOOPBACK_INTERFACES = {"lo"}  # Excluded from the total network rate
+
+# Latest per-device I/O rates in bytes per second
+io_rates = {"interfaces": {}, "disks": {}, "data_fill_rate": None, "data_fill_rate_slow": None}
+
+# Latest PSI readings for the system and each service
+pressure_state = {"system": {}, "services": {}}
+
+# Timestamp of the last tick whose system and service samples are all recorded
+last_complete_tick = None
+
+# Rolling aggregate configuration
+AGGREGATE_WINDOW = MONITOR_HISTORY_SIZE  # Samples covered by windowed min/max/mean/p95
+AGGREGATE_EWMA_ALPHA = 0.2  # Smoothing factor for the exponentially weighted mean
+AGGREGATE_QUANTILE = 0.95
+
+# Alert rules evaluated against the rolling aggregates on every monitoring tick.
+# "scope" is "system" or a service key, "stat" is one of the aggregate
+# fields (last, mean, ewma, min, max, p95) and "for_ticks" is the number of
+# consecutive breaching samples required before the alert fires.
+ALERT_RULES = [
+    {
+        "name": "system_cpu_high",
+        "scope": "system",
+        "metric": "cpu",
+        "stat": "ewma",
+        "op": ">",
+        "threshold": 90,
+        "for_ticks": 3,
+        "message": "System CPU usage is high",
+    },
+    {
+        "name": "system_memory_high",
+        "scope": "system",
+        "metric": "memory",
+        "stat": "ewma",
+        "op": ">",
+        "threshold": 90,
+        "for_ticks": 3,
+        "message": "System memory usage is high",
+    },
+    {
+        "name": "system_disk_full",
+        "scope": "system",
+        "metric": "disk",
+        "stat": "last",
+        "op": ">",
+        "threshold": 90,
+        "for_ticks": 1,
+        "message": "Root filesystem is nearly full",
+    },
+    {
+        "name": "webgui_cpu_pressure",
+        "scope": "webgui",
+        "metric": "psi_cpu_some",
+        "stat": "ewma",
+        "op": ">",
+        "threshold": 20,
+        "for_ticks": 3,
+        "message": "WebGUI is stalled waiting for CPU",
+    },
+    {
+        "name": "system_io_pressure",
+        "scope": "system",
+        "metric": "psi_io_full",
+        "stat": "ewma",
+        "op": ">",
+        "threshold": 10,
+        "for_ticks": 3,
+        "message": "All tasks are stalled on I/O",
+    },
+    {
+        "name": "webgui_memory_high",
+        "scope": "webgui",
+        "metric": "memory",
+        "stat": "ewma",
+        "op": ">",
+        "threshold": 30,
+        "for_ticks": 3,
+        "message": "WebGUI memory usage is creeping up",
+    },
+]
+
+ALERT_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Event stream configuration
+EVENT_QUEUE_SIZE = 100  # Events buffered per subscriber before dropping
+EVENT_KEEPALIVE = 15  # Seconds between keep-alive comments on idle streams
+
+# On-disk history used for exports, one NDJSON file per UTC day
+HISTORY_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+HISTORY_RETENTION_DAYS = 7
+EXPORT_DEFAULT_RANGE = 3600  # Seconds exported when no start time is given
+EXPORT_MIN_POINTS = 10  # Lower bound on the per-series downsampling target
+EXPORT_MAX_POINTS = 100000  # Upper bound on the per-series downsampling target
+
 # HTML template for the control panel
 CONTROL_PANEL_HTML = """
 <!DOCTYPE html>
@@ -198,6 +360,18 @@ CONTROL_PANEL_HTML = """
         canvas {
             max-height: 200px;
         }
+        .pressure-table {
+            width: 100%;
+            border-collapse: collapse;
+        }
+        .pressure-table th, .pressure-table td {
+            padding: 6px 10px;
+            text-align: right;
+            border-bottom: 1px solid #eee;
+        }
+        .pressure-table th:first-child, .pressure-table td:first-child {
+            text-align: left;
+        }
     </style>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
 </head>
@@ -230,12 +404,40 @@ CONTROL_PANEL_HTML = """
                     <div class="metric-value" id="network-rate">-</div>
                     <div class="metric-label">Network I/O</div>
                 </div>
+                <div class="metric">
+                    <div class="metric-value" id="disk-io-rate">-</div>
+                    <div class="metric-label">Disk I/O</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" id="data-free">-</div>
+                    <div class="metric-label" id="data-free-label">Data Free</div>
+                </div>
             </div>
             <div class="resource-chart">
                 <canvas id="system-chart"></canvas>
             </div>
         </div>
         
+        <!-- Pressure stall information -->
+        <div class="card full-width">
+            <h2>Pressure Stall</h2>
+            <table class="pressure-table">
+                <thead>
+                    <tr>
+                        <th></th>
+                        <th>CPU some</th>
+                        <th>CPU full</th>
+                        <th>Memory some</th>
+                        <th>Memory full</th>
+                        <th>I/O some</th>
+                        <th>I/O full</th>
+                    </tr>
+                </thead>
+                <tbody id="pressure-rows"></tbody>
+            </table>
+            <div class="info">% of time tasks were stalled: avg10 / avg60 / last sample</div>
+        </div>
+
         <!-- Services -->
         <div class="full-width">
             <h2>Services</h2>
@@ -244,10 +446,14 @@ CONTROL_PANEL_HTML = """
     </div>
     
     <script>
+        const POLL_INTERVAL = 5000;
+        const MAX_CHART_POINTS = 120;  // Points kept per chart before old ones are dropped
+
         // Chart.js configuration
         const chartOptions = {
             responsive: true,
             maintainAspectRatio: false,
+            animation: false,
             scales: {
                 y: {
                     beginAtZero: true,
@@ -262,32 +468,74 @@ CONTROL_PANEL_HTML = """
             }
         };
 
+        // Service CPU can exceed 100% on multi-core devices, so leave the axis open
+        const serviceChartOptions = {
+            ...chartOptions,
+            scales: {
+                y: {
+                    beginAtZero: true
+                }
+            }
+        };
+
+        function createUsageChart(canvas, options) {
+            return new Chart(canvas.getContext('2d'), {
+                type: 'line',
+                data: {
+                    labels: [],
+                    datasets: [
+                        {
+                            label: 'CPU %',
+                            data: [],
+                            borderColor: 'rgb(255, 99, 132)',
+                            backgroundColor: 'rgba(255, 99, 132, 0.1)',
+                            tension: 0.1
+                        },
+                        {
+                            label: 'Memory %',
+                            data: [],
+                            borderColor: 'rgb(54, 162, 235)',
+                            backgroundColor: 'rgba(54, 162, 235, 0.1)',
+                            tension: 0.1
+                        }
+                    ]
+                },
+                options: options
+            });
+        }
+
         // Initialize system chart
-        const systemCtx = document.getElementById('system-chart').getContext('2d');
-        const systemChart = new Chart(systemCtx, {
-            type: 'line',
-            data: {
-                labels: [],
-                datasets: [
-                    {
-                        label: 'CPU %',
-                        data: [],
-                        borderColor: 'rgb(255, 99, 132)',
-                        backgroundColor: 'rgba(255, 99, 132, 0.1)',
-                        tension: 0.1
-                    },
-                    {
-                        label: 'Memory %',
-                        data: [],
-                        borderColor: 'rgb(54, 162, 235)',
-                        backgroundColor: 'rgba(54, 162, 235, 0.1)',
-                        tension: 0.1
-                    }
-                ]
-            },
-            options: chartOptions
-        });
+        const systemChart = createUsageChart(document.getElementById('system-chart'), chartOptions);
+
+        // Service cards keyed by service, created once and patched in place
+        const serviceCards = new Map();
+        // Pressure table rows keyed by scope
+        const pressureRows = new Map();
+        // Each chart tracks the server tick it has been updated to (asOf),
+        // null until its first full history has been charted
+        const systemChartState = {chart: systemChart, asOf: null};
+
+        function setText(element, text) {
+            if (element.textContent !== text) element.textContent = text;
+        }
 
+        function appendChartPoints(state, history) {
+            if (!history) return;
+            // Skip points this chart already has when the request covered older ticks for another chart
+            const first = state.asOf === null ? 0 : history.timestamps.findIndex(ts => ts > state.asOf);
+            if (first < 0 || first >= history.timestamps.length) return;
+            const chart = state.chart;
+            chart.data.labels.push(...history.timestamps.slice(first).map(ts => new Date(ts * 1000).toLocaleTimeString()));
+            chart.data.datasets[0].data.push(...history.cpu.slice(first));
+            chart.data.datasets[1].data.push(...history.memory.slice(first));
+
+            const excess = chart.data.labels.length - MAX_CHART_POINTS;
+            if (excess > 0) {
+                chart.data.labels.splice(0, excess);
+                chart.data.datasets.forEach(dataset => dataset.data.splice(0, excess));
+            }
+            chart.update('none');
+        }
 
         async function fetchServiceStatus() {
             try {
@@ -301,9 +549,14 @@ CONTROL_PANEL_HTML = """
 
         async function fetchResourceStats() {
             try {
-                const response = await fetch('/api/resources/stats');
+                // Only ask for history newer than what every chart already has;
+                // a newly created chart gets the full history
+                const states = [systemChartState, ...serviceCards.values()];
+                const asOfs = states.map(state => state.asOf);
+                const query = asOfs.includes(null) ? '' : `?since=${Math.min(...asOfs)}`;
+                const response = await fetch('/api/resources/stats' + query);
                 const data = await response.json();
-                updateResourceUI(data);
+                updateResourceUI(data, new Set(states));
             } catch (error) {
                 console.error('Error fetching resources:', error);
             }
@@ -325,23 +578,19 @@ CONTROL_PANEL_HTML = """
                 } else {
                     // Wait a moment for service to fully start, then check status
                     if (action === 'start') {
-                        setTimeout(() => {
-                            fetchServiceStatus();
+                        setTimeout(async () => {
+                            await fetchServiceStatus();
                             // Show "ready" status after service is confirmed active
-                            setTimeout(() => {
-                                const activeServices = document.querySelectorAll('.status.active');
-                                activeServices.forEach(status => {
-                                    if (status.textContent === 'Active') {
-                                        status.className = 'status ready';
-                                        status.textContent = 'Ready';
-                                        // Reset to normal after 3 seconds
-                                        setTimeout(() => {
-                                            status.className = 'status active';
-                                            status.textContent = 'Active';
-                                        }, 3000);
-                                    }
-                                });
-                            }, 1000);
+                            const entry = serviceCards.get(service);
+                            if (entry && entry.active) {
+                                entry.status.className = 'status ready';
+                                entry.status.textContent = 'Ready';
+                                // Reset to normal after 3 seconds
+                                setTimeout(() => {
+                                    entry.status.className = 'status active';
+                                    entry.status.textContent = 'Active';
+                                }, 3000);
+                            }
                         }, 2000);
                     } else {
                         fetchServiceStatus();
@@ -354,96 +603,214 @@ CONTROL_PANEL_HTML = """
             }
         }
         
-        function updateServiceStatus(serviceName, statusClass, statusText) {
-            const services = document.querySelectorAll('.service-card');
-            services.forEach(card => {
-                const nameElement = card.querySelector('.service-name');
-                if (nameElement && nameElement.textContent.includes(serviceName)) {
-                    const statusElement = card.querySelector('.status');
-                    if (statusElement) {
-                        statusElement.className = `status ${statusClass}`;
-                        statusElement.textContent = statusText;
-                    }
-                }
-            });
+        function updateServiceStatus(service, statusClass, statusText) {
+            const entry = serviceCards.get(service);
+            if (entry) {
+                entry.status.className = `status ${statusClass}`;
+                entry.status.textContent = statusText;
+                entry.active = null;  // Let the next status refresh overwrite this
+            }
         }
 
         function formatBytes(bytes) {
-            if (bytes === 0) return '0 B';
+            if (!bytes || bytes < 1) return '0 B';
             const k = 1024;
-            const sizes = ['B', 'KB', 'MB', 'GB'];
-            const i = Math.floor(Math.log(bytes) / Math.log(k));
+            const sizes = ['B', 'KB', 'MB', 'GB', 'TB'];
+            const i = Math.min(Math.floor(Math.log(bytes) / Math.log(k)), sizes.length - 1);
             return parseFloat((bytes / Math.pow(k, i)).toFixed(1)) + ' ' + sizes[i];
         }
 
-        function updateResourceUI(data) {
+        function formatDuration(seconds) {
+            if (seconds < 3600) return Math.round(seconds / 60) + ' min';
+            if (seconds < 86400) return (seconds / 3600).toFixed(1) + ' h';
+            return (seconds / 86400).toFixed(1) + ' d';
+        }
+
+        function formatPressure(pressure, resource, kind) {
+            const line = pressure && pressure[resource] && pressure[resource][kind];
+            if (!line) return '-';
+            const stall = line.stall_percent !== undefined ? line.stall_percent.toFixed(1) : '-';
+            return `${line.avg10.toFixed(1)} / ${line.avg60.toFixed(1)} / ${stall}`;
+        }
+
+        const pressureColumns = [['cpu', 'some'], ['cpu', 'full'], ['memory', 'some'], ['memory', 'full'], ['io', 'some'], ['io', 'full']];
+
+        function updatePressureUI(data) {
+            const rows = [['System', data.system.pressure]];
+            for (const [key, service] of Object.entries(data.services)) {
+                rows.push([key, service.pressure]);
+            }
+
+            const tbody = document.getElementById('pressure-rows');
+            const seen = new Set();
+            for (const [name, pressure] of rows) {
+                seen.add(name);
+                let row = pressureRows.get(name);
+                if (!row) {
+                    row = tbody.insertRow();
+                    row.insertCell().textContent = name;
+                    pressureColumns.forEach(() => row.insertCell());
+                    pressureRows.set(name, row);
+                }
+                pressureColumns.forEach(([resource, kind], i) =>
+                    setText(row.cells[i + 1], formatPressure(pressure, resource, kind)));
+            }
+            for (const [name, row] of pressureRows) {
+                if (!seen.has(name)) {
+                    row.remove();
+                    pressureRows.delete(name);
+                }
+            }
+        }
+
+        function updateResourceUI(data, requested) {
             // Update system metrics
-            document.getElementById('cpu-usage').textContent = data.system.cpu.toFixed(1) + '%';
-            document.getElementById('memory-usage').textContent = data.system.memory.percent.toFixed(1) + '%';
-            document.getElementById('disk-usage').textContent = data.system.disk.percent.toFixed(1) + '%';
-            document.getElementById('network-rate').textContent = 
+            setText(document.getElementById('cpu-usage'), data.system.cpu.toFixed(1) + '%');
+            setText(document.getElementById('memory-usage'), data.system.memory.percent.toFixed(1) + '%');
+            setText(document.getElementById('disk-usage'), data.system.disk.percent.toFixed(1) + '%');
+            setText(document.getElementById('network-rate'),
                 '↓' + formatBytes(data.system.network.bytes_recv) + '/s ' +
-                '↑' + formatBytes(data.system.network.bytes_sent) + '/s';
-
-            // Update system chart
-            if (data.system.history) {
-                const labels = data.system.history.timestamps.map(ts => {
-                    const date = new Date(ts * 1000);
-                    return date.toLocaleTimeString();
-                });
-                
-                systemChart.data.labels = labels;
-                systemChart.data.datasets[0].data = data.system.history.cpu;
-                systemChart.data.datasets[1].data = data.system.history.memory;
-                systemChart.update('none');
+                '↑' + formatBytes(data.system.network.bytes_sent) + '/s');
+            setText(document.getElementById('disk-io-rate'),
+                'R ' + formatBytes(data.system.disk_io.read_bytes) + '/s ' +
+                'W ' + formatBytes(data.system.disk_io.write_bytes) + '/s');
+            const dataMount = data.system.data_mount;
+            setText(document.getElementById('data-free'), formatBytes(dataMount.free));
+            setText(document.getElementById('data-free-label'),
+                `Data Free (${dataMount.path})` +
+                (dataMount.time_to_full !== null ? ` · full in ${formatDuration(dataMount.time_to_full)}` : ''));
+
+            // Append new points to the system and per-service charts
+            // Charts created while this request was in flight wait for the next one
+            appendChartPoints(systemChartState, data.system.history);
+            for (const [key, entry] of serviceCards) {
+                const service = data.services[key];
+                if (service) {
+                    if (requested.has(entry)) appendChartPoints(entry, service.history);
+                    setText(entry.usage,
+                        `CPU: ${service.cpu.toFixed(1)}% | ` +
+                        `Memory: ${formatBytes(service.memory)} (${service.memory_percent.toFixed(1)}%) | ` +
+                        `Processes: ${service.num_processes}`);
+                } else {
+                    setText(entry.usage, '');
+                }
+            }
+            if (data.as_of !== null) {
+                systemChartState.asOf = data.as_of;
+                for (const entry of serviceCards.values()) {
+                    if (requested.has(entry)) entry.asOf = data.as_of;
+                }
             }
 
+            updatePressureUI(data);
+        }
+
+        function createServiceCard(key) {
+            const card = document.createElement('div');
+            card.className = 'service-card card';
+            card.innerHTML = `
+                <div class="service-header">
+                    <div class="service-name"></div>
+                    <div class="status"></div>
+                </div>
+                <div class="info">
+                    <span class="service-details"></span>
+                    <span class="service-ready"> | <strong>Service is ready and accessible at <a href="/" target="_blank">root URL</a></strong></span>
+                </div>
+                <div class="info service-usage"></div>
+                <div class="controls">
+                    <button class="start">Start</button>
+                    <button class="stop">Stop</button>
+                    <button class="restart">Restart</button>
+                </div>
+                <div class="chart-container">
+                    <canvas></canvas>
+                </div>
+            `;
+
+            const entry = {
+                card: card,
+                name: card.querySelector('.service-name'),
+                status: card.querySelector('.status'),
+                details: card.querySelector('.service-details'),
+                ready: card.querySelector('.service-ready'),
+                usage: card.querySelector('.service-usage'),
+                buttons: {},
+                active: null,
+                asOf: null
+            };
+            for (const action of ['start', 'stop', 'restart']) {
+                entry.buttons[action] = card.querySelector(`button.${action}`);
+                entry.buttons[action].addEventListener('click', () => controlService(key, action));
+            }
+            document.getElementById('services').appendChild(card);
+            entry.chart = createUsageChart(card.querySelector('canvas'), serviceChartOptions);
+            return entry;
         }
 
         function updateUI(services) {
-            const container = document.getElementById('services');
-            container.innerHTML = '';
-            
             for (const [key, service] of Object.entries(services)) {
-                const card = document.createElement('div');
-                card.className = 'service-card card';
-                
-                const statusClass = service.active ? 'active' : 'inactive';
-                const statusText = service.active ? 'Active' : 'Inactive';
-                
-                card.innerHTML = `
-                    <div class="service-header">
-                        <div class="service-name">${service.name}</div>
-                        <div class="status ${statusClass}">${statusText}</div>
-                    </div>
-                    <div class="info">
-                        Port: ${service.port} | 
-                        Systemd Unit: ${service.systemd_unit}
-                        ${service.active ? ' | <strong>Service is ready and accessible at <a href="/" target="_blank">root URL</a></strong>' : ''}
-                    </div>
-                    <div class="controls">
-                        <button class="start" onclick="controlService('${key}', 'start')" 
-                                ${service.active ? 'disabled' : ''}>Start</button>
-                        <button class="stop" onclick="controlService('${key}', 'stop')" 
-                                ${!service.active ? 'disabled' : ''}>Stop</button>
-                        <button class="restart" onclick="controlService('${key}', 'restart')"
-                                ${!service.active ? 'disabled' : ''}>Restart</button>
-                    </div>
-                `;
-                
-                container.appendChild(card);
+                let entry = serviceCards.get(key);
+                if (!entry) {
+                    entry = createServiceCard(key);
+                    serviceCards.set(key, entry);
+                }
+
+                setText(entry.name, service.name);
+                setText(entry.details,
+                    (service.port !== null ? `Port: ${service.port} | ` : '') +
+                    `Systemd Unit: ${service.systemd_unit}`);
+                if (entry.active !== service.active) {
+                    entry.active = service.active;
+                    entry.status.className = `status ${service.active ? 'active' : 'inactive'}`;
+                    entry.status.textContent = service.active ? 'Active' : 'Inactive';
+                    entry.ready.hidden = !service.active;
+                    entry.buttons.start.disabled = service.active;
+                    entry.buttons.stop.disabled = !service.active;
+                    entry.buttons.restart.disabled = !service.active;
+                }
+            }
+
+            // Drop cards for services that are no longer configured
+            for (const [key, entry] of serviceCards) {
+                if (!(key in services)) {
+                    entry.chart.destroy();
+                    entry.card.remove();
+                    serviceCards.delete(key);
+                }
             }
         }
 
-        // Fetch status on load
-        fetchServiceStatus();
-        fetchResourceStats();
-        
-        // Update every 5 seconds
-        setInterval(() => {
-            fetchServiceStatus();
-            fetchResourceStats();
-        }, 5000);
+        // Poll only while the page is visible. Hidden tabs stop polling and
+        // catch up with a single fetch when they become visible again.
+        let pollTimer = null;
+        let polling = false;
+
+        async function poll() {
+            clearTimeout(pollTimer);
+            if (polling || document.hidden) return;
+            polling = true;
+            try {
+                // Status first, so cards exist before their history arrives
+                await fetchServiceStatus();
+                await fetchResourceStats();
+            } finally {
+                polling = false;
+            }
+            if (!document.hidden) {
+                pollTimer = setTimeout(poll, POLL_INTERVAL);
+            }
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.hidden) {
+                clearTimeout(pollTimer);
+            } else {
+                poll();
+            }
+        });
+
+        poll();
     </script>
 </body>
 </html>
@@ -453,7 +820,7 @@ CONTROL_PANEL_HTML = """
 def run_systemctl(action, service_unit):
     """Run systemctl command and return success status"""
     try:
-        cmd = ["sudo", "systemctl", action, service_unit]
+        cmd = ["sudo", "systemctl", action, "--", service_unit]
         result = subprocess.run(cmd, capture_output=True, text=True)
         return result.returncode == 0, result.stderr
     except Exception as e:
@@ -492,26 +859,135 @@ def toggle_nginx_site(nginx_config_path, enable=True):
         return False, str(e)
 
 
-def get_service_status(service_unit):
-    """Check if a systemd service is active"""
+def get_units_state(service_units):
+    """Get active state and main PID of several systemd units with one systemctl call.
+
+    Returns {unit: {"active": bool, "pid": int or None}}.
+    """
+    states = {unit: {"active": False, "pid": None} for unit in service_units}
+    if not service_units:
+        return states
     try:
-        cmd = ["systemctl", "is-active", service_unit]
+        cmd = ["systemctl", "show", "--property=ActiveState,MainPID", "--", *service_units]
         result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.stdout.strip() == "active"
-    except:
-        return False
+        if result.returncode != 0:
+            return states
+
+        # systemctl prints one blank-line separated block per unit, in argument order
+        blocks = result.stdout.strip().split("\n\n")
+        for unit, block in zip(service_units, blocks):
+            properties = dict(
+                line.split("=", 1) for line in block.splitlines() if "=" in line
+            )
+            pid = properties.get("MainPID", "0")
+            states[unit] = {
+                "active": properties.get("ActiveState") == "active",
+                "pid": int(pid) if pid.isdigit() and pid != "0" else None,
+            }
+    except Exception as e:
+        logger.warning(f"Failed to query systemd units: {e}")
+    return states
 
 
-def get_service_pid(service_unit):
-    """Get the main PID of a systemd service"""
-    try:
-        cmd = ["systemctl", "show", service_unit, "--property=MainPID"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            pid = result.stdout.strip().split("=")[1]
-            return int(pid) if pid and pid != "0" else None
-    except:
-        return None
+class ServiceRegistry:
+    """Snapshot of the managed services with precomputed lookup indexes.
+
+    A registry is never modified after construction, a reload builds a new
+    one and swaps it in, so readers always see a consistent set of services.
+    """
+
+    REQUIRED_FIELDS = ("name", "systemd_unit")
+    # Unit names end up on the systemctl command line, so only accept names
+    # systemd itself would (no leading dash, known unit type suffix)
+    UNIT_NAME_PATTERN = re.compile(
+        r"[A-Za-z0-9:_.\\@][A-Za-z0-9:_.\\@-]*"
+        r"\.(service|socket|target|timer|mount|automount|path|scope|slice|swap|device)"
+    )
+
+    def __init__(self, services, exclusive_groups=()):
+        for key, config in services.items():
+            if not isinstance(config, dict):
+                raise ValueError(f"Service {key} must be a table of settings")
+            missing = [field for field in self.REQUIRED_FIELDS if not config.get(field)]
+            if missing:
+                raise ValueError(f"Service {key} is missing {', '.join(missing)}")
+            for field in ("name", "systemd_unit", "nginx_config"):
+                value = config.get(field)
+                if value is not None and not isinstance(value, str):
+                    raise ValueError(f"Service {key} {field} must be a string, got {value!r}")
+            if not self.UNIT_NAME_PATTERN.fullmatch(config["systemd_unit"]):
+                raise ValueError(
+                    f"Service {key} systemd_unit {config['systemd_unit']!r} is not a valid unit name"
+                )
+            nginx_config = config.get("nginx_config")
+            if nginx_config and not os.path.isabs(nginx_config):
+                raise ValueError(f"Service {key} nginx_config must be an absolute path")
+            port = config.get("port")
+            if port is not None and (
+                not isinstance(port, int) or isinstance(port, bool) or not 0 < port < 65536
+            ):
+                raise ValueError(f"Service {key} port must be an integer between 1 and 65535")
+            self._check_service_keys(
+                config.get("mutually_exclusive_with", []),
+                services,
+                f"Service {key} mutually_exclusive_with",
+            )
+
+        # Exclusivity is the safety guarantee of the controller, so reject
+        # malformed groups rather than silently ignoring them
+        if not isinstance(exclusive_groups, (list, tuple)):
+            raise ValueError("exclusive_groups must be a list of lists of service keys")
+        for group in exclusive_groups:
+            self._check_service_keys(group, services, "exclusive_groups entry")
+
+        self.services = services
+        self.units = [config["systemd_unit"] for config in services.values()]
+
+        # Exclusivity is symmetric, whether declared per service or as a group
+        exclusive = {key: set() for key in services}
+        pairs = [
+            (key, other)
+            for key, config in services.items()
+            for other in config.get("mutually_exclusive_with", [])
+        ]
+        pairs.extend((key, other) for group in exclusive_groups for key in group for other in group)
+        for key, other in pairs:
+            if key != other:
+                exclusive[key].add(other)
+                exclusive[other].add(key)
+        self.exclusive_with = {key: sorted(others) for key, others in exclusive.items()}
+
+    @staticmethod
+    def _check_service_keys(value, services, what):
+        """Raise ValueError unless value is a list of configured service keys"""
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{what} must be a list of service keys, got {value!r}")
+        unknown = [key for key in value if not isinstance(key, str) or key not in services]
+        if unknown:
+            raise ValueError(f"{what} references unknown services: {unknown}")
+
+    @classmethod
+    def from_config(cls, data):
+        """Build a registry from a parsed {"services": {...}, "exclusive_groups": [...]} mapping"""
+        services = data.get("services")
+        if not isinstance(services, dict) or not services:
+            raise ValueError("Configuration must define at least one service")
+        groups = data.get("exclusive_groups", [])
+        return cls({key: dict(config) for key, config in services.items()}, groups)
+
+
+def load_services_config(path):
+    """Load a ServiceRegistry from a TOML or YAML configuration file"""
+    with open(path, "rb") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ValueError("PyYAML is required for YAML service configurations")
+            data = yaml.safe_load(f) or {}
+        else:
+            if tomllib is None:
+                raise ValueError("tomli is required for TOML service configurations on Python < 3.11")
+            data = tomllib.load(f)
+    return ServiceRegistry.from_config(data)
 
 
 def get_process_resources(pid):
@@ -548,9 +1024,13 @@ def get_system_resources():
 
     # Disk usage
     disk = psutil.disk_usage("/")
+    data_mount = psutil.disk_usage(DATA_MOUNT)
 
-    # Network I/O
+    # Network and disk I/O counters, timestamped together for rate calculation
     net_io = psutil.net_io_counters()
+    interfaces = psutil.net_io_counters(pernic=True, nowrap=True)
+    disks = psutil.disk_io_counters(perdisk=True, nowrap=True) or {}
+    counters_time = time.monotonic()
 
     return {
         "cpu": cpu_percent,
@@ -560,26 +1040,600 @@ def get_system_resources():
             "percent": memory.percent,
         },
         "disk": {"total": disk.total, "used": disk.used, "percent": disk.percent},
-        "network": {"bytes_sent": net_io.bytes_sent, "bytes_recv": net_io.bytes_recv},
+        "data_mount": {
+            "path": DATA_MOUNT,
+            "total": data_mount.total,
+            "used": data_mount.used,
+            "free": data_mount.free,
+            "percent": data_mount.percent,
+        },
+        "network": {
+            "bytes_sent": net_io.bytes_sent,
+            "bytes_recv": net_io.bytes_recv,
+            "interfaces": interfaces,
+        },
+        "disk_io": {"disks": disks},
+        "counters_time": counters_time,
     }
 
 
+@functools.lru_cache(maxsize=None)
+def is_physical_disk(device):
+    """Check whether a block device is a physical whole disk.
+
+    Partitions, loop/zram devices and stacked dm/md devices are excluded so
+    the same bytes are not counted more than once in the disk totals.
+    """
+    if not os.path.isdir("/sys/block"):
+        return True
+    if device.startswith(("loop", "zram", "ram")):
+        return False
+    path = f"/sys/block/{device}"
+    if not os.path.exists(f"{path}/device"):
+        return False
+    try:
+        return not os.listdir(f"{path}/slaves")
+    except OSError:
+        return True
+
+
+def read_pressure(path):
+    """Parse a PSI file into {"some": {...}, "full": {...}}, None if unavailable"""
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    pressure = {}
+    for line in lines:
+        kind, *fields = line.split()
+        values = dict(field.split("=", 1) for field in fields)
+        pressure[kind] = {
+            "avg10": float(values["avg10"]),
+            "avg60": float(values["avg60"]),
+            "avg300": float(values["avg300"]),
+            "total": int(values["total"]),
+        }
+    return pressure
+
+
+def get_pressure(cgroup=None):
+    """Get PSI for cpu, memory and io, system-wide or for a cgroup v2 path"""
+    pressure = {}
+    for resource in PSI_RESOURCES:
+        if cgroup is None:
+            path = os.path.join(PSI_ROOT, resource)
+        else:
+            path = os.path.join(CGROUP_ROOT, cgroup.lstrip("/"), f"{resource}.pressure")
+        stats = read_pressure(path)
+        if stats:
+            pressure[resource] = stats
+    return pressure
+
+
+def get_process_cgroup(pid):
+    """Get the cgroup v2 path of a process, None on cgroup v1 or if it has exited"""
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            for line in f:
+                hierarchy, _, path = line.rstrip("\n").split(":", 2)
+                if hierarchy == "0":
+                    return path
+    except OSError:
+        pass
+    return None
+
+
+def update_pressure_stalls(pressure, stall_rates, now):
+    """Add the stalled percentage of time since the last sample to each PSI line.
+
+    ``stall_rates`` is a CounterRates over the cumulative stall totals, which
+    are in microseconds. Returns the history values keyed by PSI_HISTORY_KEYS.
+    """
+    totals = {
+        f"{resource}.{kind}": line
+        for resource, lines in pressure.items()
+        for kind, line in lines.items()
+    }
+    for key, rates in stall_rates.update(totals, now).items():
+        resource, kind = key.split(".")
+        pressure[resource][kind]["stall_percent"] = rates["total"] / 1e4
+
+    history = {}
+    for resource in PSI_RESOURCES:
+        for kind in PSI_KINDS:
+            line = pressure.get(resource, {}).get(kind, {})
+            history[f"psi_{resource}_{kind}"] = line.get("stall_percent")
+    return history
+
+
+class CounterRates:
+    """Per-second rates from cumulative per-device counters.
+
+    Rates are divided by the monotonic time elapsed between samples, so
+    irregular tick spacing does not skew them, and the first sample of a
+    device yields no rate. psutil already corrects wraps (``nowrap=True``),
+    so a counter that goes backwards has been reset, e.g. a re-plugged USB
+    adapter or a recreated cgroup, and is counted from zero. Samples may be
+    namedtuples or dicts.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._last = {}
+        self._last_time = None
+
+    def update(self, counters, now):
+        """Record a sample of {device: counters} and return {device: {field: rate}}"""
+        rates = {}
+        elapsed = None if self._last_time is None else now - self._last_time
+        for device, sample in counters.items():
+            if isinstance(sample, dict):
+                values = {field: sample[field] for field in self.fields}
+            else:
+                values = {field: getattr(sample, field) for field in self.fields}
+            previous = self._last.get(device)
+            if previous is not None and elapsed and elapsed > 0:
+                device_rates = {}
+                for field, value in values.items():
+                    delta = value - previous[field]
+                    if delta < 0:
+                        delta = value
+                    device_rates[field] = delta / elapsed
+                rates[device] = device_rates
+            self._last[device] = values
+
+        # Forget devices that have gone away (e.g. unplugged USB adapters)
+        for device in set(self._last) - set(counters):
+            del self._last[device]
+        self._last_time = now
+        return rates
+
+
+class RollingAggregate:
+    """Rolling statistics for a single metric over the last ``window`` samples.
+
+    Mean, min and max are updated in O(1) per sample. The quantile is exact
+    over the same window, using a sorted copy updated by bisection.
+    """
+
+    def __init__(self, window=AGGREGATE_WINDOW, alpha=AGGREGATE_EWMA_ALPHA,
+                 quantile=AGGREGATE_QUANTILE):
+        self.window = window
+        self.alpha = alpha
+        self.quantile = quantile
+        self.count = 0
+        self.last = None
+        self.ewma = None
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        # Monotonic deques of (sequence, value) for the windowed min and max
+        self._min = deque()
+        self._max = deque()
+        # Window values in sorted order for the quantile
+        self._sorted = []
+
+    def add(self, value):
+        seq = self.count
+        self.count += 1
+        self.last = value
+
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            self.ewma += self.alpha * (value - self.ewma)
+
+        if len(self._values) == self.window:
+            oldest = self._values[0]
+            self._sum -= oldest
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        bisect.insort(self._sorted, value)
+        self._values.append(value)
+        self._sum += value
+
+        expired = seq - self.window
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        if self._min[0][0] <= expired:
+            self._min.popleft()
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        if self._max[0][0] <= expired:
+            self._max.popleft()
+
+    def snapshot(self):
+        """Return the current aggregates as a JSON-serialisable dict"""
+        if not self.count:
+            return None
+        return {
+            "last": self.last,
+            "mean": self._sum / len(self._values),
+            "ewma": self.ewma,
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+            "p95": self._sorted[round(self.quantile * (len(self._sorted) - 1))],
+            "count": self.count,
+        }
+
+
+class HistoryLog:
+    """Append-only history of samples stored as one NDJSON file per UTC day.
+
+    Each line is {"timestamp": ..., "system": {...}, "services": {key: {...}}}.
+    Files older than ``retention_days`` are removed when the day rolls over.
+    """
+
+    def __init__(self, directory, retention_days):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._file = None
+        self._day = None
+
+    def _path(self, day):
+        return os.path.join(self.directory, f"history-{day.isoformat()}.ndjson")
+
+    def append(self, record):
+        day = datetime.fromtimestamp(record["timestamp"], timezone.utc).date()
+        try:
+            if day != self._day:
+                if self._file:
+                    self._file.close()
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self._path(day), "a")
+                self._day = day
+                self.prune(day)
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+        except OSError as e:
+            logger.warning(f"Failed to write history log: {e}")
+
+    def prune(self, today):
+        """Remove daily files older than the retention period"""
+        cutoff = self._path(today - timedelta(days=self.retention_days))
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith("history-") and path < cutoff:
+                os.remove(path)
+
+    def read(self, start, end):
+        """Yield records with start <= timestamp <= end, oldest first, one line at a time"""
+        day = datetime.fromtimestamp(start, timezone.utc).date()
+        last_day = datetime.fromtimestamp(end, timezone.utc).date()
+        while day <= last_day:
+            try:
+                with open(self._path(day)) as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # Partially written line
+                        if record["timestamp"] > end:
+                            return
+                        if record["timestamp"] >= start:
+                            yield record
+            except FileNotFoundError:
+                pass
+            day += timedelta(days=1)
+
+
+class LTTBBucket:
+    """Running summary of one LTTB bucket: average, extremes and last point"""
+
+    __slots__ = ("index", "count", "sum_t", "sum_v", "min", "max", "last")
+
+    def __init__(self, index, point):
+        self.index = index
+        self.count = 1
+        self.sum_t, self.sum_v = point
+        self.min = self.max = self.last = point
+
+    def add(self, point):
+        self.count += 1
+        self.sum_t += point[0]
+        self.sum_v += point[1]
+        if point[1] < self.min[1]:
+            self.min = point
+        elif point[1] > self.max[1]:
+            self.max = point
+        self.last = point
+
+    def average(self):
+        return self.sum_t / self.count, self.sum_v / self.count
+
+
+class LTTBDownsampler:
+    """Streaming Largest-Triangle-Three-Buckets over fixed-width time buckets.
+
+    The first point is always kept, then one point per non-empty bucket is
+    chosen by the largest triangle with the previously kept point and the
+    average of the next non-empty bucket. The last point is always kept.
+    As in MinMaxLTTB, only each bucket's minimum and maximum are candidates,
+    so a bucket is a fixed-size summary and memory does not grow with the
+    number of points in it.
+    """
+
+    def __init__(self, start, width):
+        self.start = start
+        self.width = width
+        self._selected = None
+        self._pending = None  # Bucket awaiting selection
+        self._following = None  # Bucket whose average drives the selection
+
+    def add(self, timestamp, value):
+        point = (timestamp, value)
+        if self._selected is None:
+            self._selected = point
+            return [point]
+
+        bucket = int((timestamp - self.start) // self.width)
+        if self._pending is None:
+            self._pending = LTTBBucket(bucket, point)
+        elif bucket == self._pending.index:
+            self._pending.add(point)
+        elif self._following is None:
+            self._following = LTTBBucket(bucket, point)
+        elif bucket == self._following.index:
+            self._following.add(point)
+        else:
+            selected = self._select()
+            self._pending = self._following
+            self._following = LTTBBucket(bucket, point)
+            return [selected]
+        return []
+
+    def _select(self):
+        avg_t, avg_v = self._following.average()
+        a_t, a_v = self._selected
+        self._selected = max(
+            (self._pending.min, self._pending.max),
+            key=lambda p: abs((a_t - avg_t) * (p[1] - a_v) - (a_t - p[0]) * (avg_v - a_v)),
+        )
+        return self._selected
+
+    def finish(self):
+        points = []
+        if self._pending and self._following:
+            points.append(self._select())
+            points.append(self._following.last)
+        elif self._pending:
+            points.append(self._pending.last)
+        self._pending = self._following = None
+        return points
+
+
+class MinMaxDownsampler:
+    """Streaming min/max bucketing, keeping the extremes of each time bucket in order"""
+
+    def __init__(self, start, width):
+        self.start = start
+        self.width = width
+        self._bucket = None
+        self._min = None
+        self._max = None
+
+    def add(self, timestamp, value):
+        point = (timestamp, value)
+        bucket = int((timestamp - self.start) // self.width)
+        points = []
+        if bucket != self._bucket:
+            points = self.finish()
+            self._bucket = bucket
+            self._min = self._max = point
+        elif value < self._min[1]:
+            self._min = point
+        elif value > self._max[1]:
+            self._max = point
+        return points
+
+    def finish(self):
+        if self._bucket is None:
+            return []
+        points = sorted({self._min, self._max})
+        self._bucket = self._min = self._max = None
+        return points
+
+
+DOWNSAMPLERS = {"lttb": LTTBDownsampler, "minmax": MinMaxDownsampler}
+
+
+def export_history(start, end, scopes=None, metrics=None, points=None, method="lttb"):
+    """Yield (timestamp, scope, metric, value) rows from the history log.
+
+    With ``points`` set, every series is downsampled to roughly that many
+    points using the chosen method. Memory use does not grow with the range.
+    """
+    samplers = {}
+    if points:
+        buckets = max(points - 2, 1) if method == "lttb" else max(points // 2, 1)
+        width = max(end - start, 1) / buckets
+
+    for record in history_log.read(start, end):
+        timestamp = record["timestamp"]
+        series = [("system", record.get("system", {}))]
+        series.extend(record.get("services", {}).items())
+        for scope, values in series:
+            if scopes and scope not in scopes:
+                continue
+            for metric, value in values.items():
+                if value is None or (metrics and metric not in metrics):
+                    continue
+                if not points:
+                    yield timestamp, scope, metric, value
+                    continue
+                sampler = samplers.get((scope, metric))
+                if sampler is None:
+                    sampler = samplers[(scope, metric)] = DOWNSAMPLERS[method](start, width)
+                for point_time, point_value in sampler.add(timestamp, value):
+                    yield point_time, scope, metric, point_value
+
+    for (scope, metric), sampler in samplers.items():
+        for point_time, point_value in sampler.finish():
+            yield point_time, scope, metric, point_value
+
+
+history_log = HistoryLog(HISTORY_LOG_DIR, HISTORY_RETENTION_DAYS)
+
+# Rolling aggregates keyed by metric (system) or by service then metric
+system_aggregates = defaultdict(RollingAggregate)
+service_aggregates = defaultdict(lambda: defaultdict(RollingAggregate))
+
+# Alert state keyed by rule name
+alert_state = {}
+
+# Event stream subscribers, one bounded queue per connected client
+event_subscribers = set()
+event_lock = Lock()
+
+
+def publish_event(event_type, data):
+    """Send an event to every connected event stream subscriber"""
+    message = {"type": event_type, "timestamp": time.time(), "data": data}
+    with event_lock:
+        subscribers = list(event_subscribers)
+    for subscriber in subscribers:
+        try:
+            subscriber.put_nowait(message)
+        except queue.Full:
+            logger.warning("Dropping event for slow event stream subscriber")
+
+
+def history_since(history, since=None, until=None):
+    """Copy history columns, keeping only samples newer than ``since`` and
+    no newer than ``until``. Caller holds resource_lock."""
+    timestamps = history["timestamps"]
+    end = len(timestamps)
+    if until is not None:
+        while end and timestamps[end - 1] > until:
+            end -= 1
+    start = end
+    while start and (since is None or timestamps[start - 1] > since):
+        start -= 1
+    return {key: list(itertools.islice(values, start, end)) for key, values in history.items()}
+
+
+def get_aggregate_snapshot(scope):
+    """Get aggregates for "system" or a service key. Caller holds resource_lock."""
+    if scope == "system":
+        aggregates = system_aggregates
+    elif scope in service_aggregates:
+        aggregates = service_aggregates[scope]
+    else:
+        return {}
+    return {metric: agg.snapshot() for metric, agg in aggregates.items()}
+
+
+def get_active_alerts():
+    """Get the currently firing alerts. Caller holds resource_lock."""
+    return [dict(state, name=name) for name, state in alert_state.items() if state["firing"]]
+
+
+def evaluate_alerts(sampled_scopes, timestamp):
+    """Evaluate alert rules against the aggregates sampled on this tick.
+
+    Rules whose scope was not sampled (e.g. a stopped service) are reset.
+    Returns a list of alert transitions. Caller holds resource_lock.
+    """
+    transitions = []
+    for rule in ALERT_RULES:
+        state = alert_state.setdefault(
+            rule["name"],
+            {"firing": False, "breaches": 0, "since": None, "value": None},
+        )
+        state.update(
+            scope=rule["scope"],
+            metric=rule["metric"],
+            stat=rule["stat"],
+            op=rule["op"],
+            threshold=rule["threshold"],
+            message=rule["message"],
+        )
+
+        value = None
+        if rule["scope"] in sampled_scopes:
+            snapshot = get_aggregate_snapshot(rule["scope"]).get(rule["metric"])
+            if snapshot:
+                value = snapshot.get(rule["stat"])
+        state["value"] = value
+
+        compare = ALERT_OPERATORS[rule["op"]]
+        if value is not None and compare(value, rule["threshold"]):
+            state["breaches"] += 1
+        else:
+            state["breaches"] = 0
+
+        firing = state["breaches"] >= rule.get("for_ticks", 1)
+        if firing != state["firing"]:
+            state["firing"] = firing
+            state["since"] = timestamp
+            transitions.append(dict(state, name=rule["name"]))
+            log = logger.warning if firing else logger.info
+            log(f"Alert {rule['name']} {'firing' if firing else 'resolved'}: {value}")
+
+    return transitions
+
+
 # Background thread for resource monitoring
 def monitor_resources():
     """Background thread to continuously monitor resources"""
-    last_net_sent = 0
-    last_net_recv = 0
+    global last_complete_tick
+    net_rates = CounterRates(("bytes_sent", "bytes_recv"))
+    disk_rates = CounterRates(("read_bytes", "write_bytes"))
+    # Cumulative PSI stall totals in microseconds, per scope
+    system_stall_rates = CounterRates(("total",))
+    service_stall_rates = defaultdict(lambda: CounterRates(("total",)))
+    last_data_free = None
+    last_data_time = None
+    data_fill_rate_slow = None
 
     while True:
         try:
             # Get system resources
             sys_resources = get_system_resources()
+            now = sys_resources["counters_time"]
+
+            # Calculate per-second network and disk rates
+            interface_rates = net_rates.update(sys_resources["network"]["interfaces"], now)
+            disk_device_rates = disk_rates.update(sys_resources["disk_io"]["disks"], now)
+            net_sent_rate = net_recv_rate = None
+            if interface_rates:
+                external = [
+                    rates for nic, rates in interface_rates.items()
+                    if nic not in LOOPBACK_INTERFACES
+                ]
+                net_sent_rate = sum(rates["bytes_sent"] for rates in external)
+                net_recv_rate = sum(rates["bytes_recv"] for rates in external)
+            disk_read_rate = disk_write_rate = None
+            if disk_device_rates:
+                physical_disks = [
+                    rates for device, rates in disk_device_rates.items()
+                    if is_physical_disk(device)
+                ]
+                disk_read_rate = sum(rates["read_bytes"] for rates in physical_disks)
+                disk_write_rate = sum(rates["write_bytes"] for rates in physical_disks)
+
+            # Calculate how fast the data mount is filling up
+            data_free = sys_resources["data_mount"]["free"]
+            data_fill_rate = None
+            if last_data_free is not None and now > last_data_time:
+                elapsed = now - last_data_time
+                data_fill_rate = (last_data_free - data_free) / elapsed
+                # Time-weighted EWMA, so irregular tick spacing keeps the same time constant
+                if data_fill_rate_slow is None:
+                    data_fill_rate_slow = data_fill_rate
+                else:
+                    weight = 1 - math.exp(-elapsed / DATA_FILL_RATE_TAU)
+                    data_fill_rate_slow += weight * (data_fill_rate - data_fill_rate_slow)
+            last_data_free = data_free
+            last_data_time = now
 
-            # Calculate network rates
-            net_sent_rate = sys_resources["network"]["bytes_sent"] - last_net_sent
-            net_recv_rate = sys_resources["network"]["bytes_recv"] - last_net_recv
-            last_net_sent = sys_resources["network"]["bytes_sent"]
-            last_net_recv = sys_resources["network"]["bytes_recv"]
+            # Read system-wide pressure stall information
+            system_pressure = get_pressure()
+            system_stalls = update_pressure_stalls(
+                system_pressure, system_stall_rates, time.monotonic()
+            )
 
             # Update system history
             with resource_lock:
@@ -589,16 +1643,57 @@ def monitor_resources():
                 system_history["disk"].append(sys_resources["disk"]["percent"])
                 system_history["network_sent"].append(net_sent_rate)
                 system_history["network_recv"].append(net_recv_rate)
+                system_history["disk_read"].append(disk_read_rate)
+                system_history["disk_write"].append(disk_write_rate)
+                system_history["data_free"].append(data_free)
+                for key, value in system_stalls.items():
+                    system_history[key].append(value)
                 system_history["timestamps"].append(timestamp)
-
-            # Monitor each active service
-            for service_key, service_config in SERVICES.items():
-                if get_service_status(service_config["systemd_unit"]):
-                    pid = get_service_pid(service_config["systemd_unit"])
+                io_rates["interfaces"] = interface_rates
+                io_rates["disks"] = disk_device_rates
+                io_rates["data_fill_rate"] = data_fill_rate
+                io_rates["data_fill_rate_slow"] = data_fill_rate_slow
+                pressure_state["system"] = system_pressure
+
+                system_aggregates["cpu"].add(sys_resources["cpu"])
+                system_aggregates["memory"].add(sys_resources["memory"]["percent"])
+                system_aggregates["disk"].add(sys_resources["disk"]["percent"])
+                system_aggregates["data_free"].add(data_free)
+                for metric, value in (
+                    ("network_sent", net_sent_rate),
+                    ("network_recv", net_recv_rate),
+                    ("disk_read", disk_read_rate),
+                    ("disk_write", disk_write_rate),
+                    ("data_fill_rate", data_fill_rate),
+                    *system_stalls.items(),
+                ):
+                    if value is not None:
+                        system_aggregates[metric].add(value)
+            sampled_scopes = {"system"}
+
+            # Monitor each active service, querying all units in one call
+            current = registry
+            states = get_units_state(current.units)
+            for service_key, service_config in current.services.items():
+                state = states[service_config["systemd_unit"]]
+                if state["active"]:
+                    pid = state["pid"]
                     if pid:
                         resources = get_process_resources(pid)
                         if resources:
+                            # Read pressure stall information for the unit's cgroup
+                            cgroup = get_process_cgroup(pid)
+                            service_pressure = get_pressure(cgroup) if cgroup else {}
+                            service_stalls = update_pressure_stalls(
+                                service_pressure,
+                                service_stall_rates[service_key],
+                                time.monotonic(),
+                            )
                             with resource_lock:
+                                # Skip services removed by a reload during this tick,
+                                # appending would recreate their dropped state
+                                if service_key not in registry.services:
+                                    continue
                                 resource_history[service_key]["cpu"].append(
                                     resources["cpu"]
                                 )
@@ -608,6 +1703,50 @@ def monitor_resources():
                                 resource_history[service_key]["timestamps"].append(
                                     timestamp
                                 )
+                                service_aggregates[service_key]["cpu"].add(
+                                    resources["cpu"]
+                                )
+                                service_aggregates[service_key]["memory"].add(
+                                    resources["memory_percent"]
+                                )
+                                for key, value in service_stalls.items():
+                                    resource_history[service_key][key].append(value)
+                                    if value is not None:
+                                        service_aggregates[service_key][key].add(value)
+                                pressure_state["services"][service_key] = service_pressure
+                            sampled_scopes.add(service_key)
+
+            # Drop stall counters of removed or stopped services so a restarted
+            # unit's fresh cgroup starts a new baseline instead of a bogus rate
+            for service_key in set(service_stall_rates) - sampled_scopes:
+                del service_stall_rates[service_key]
+
+            # Evaluate alert rules and notify event stream subscribers
+            with resource_lock:
+                transitions = evaluate_alerts(sampled_scopes, timestamp)
+                last_complete_tick = timestamp
+                record = {
+                    "timestamp": timestamp,
+                    "system": {
+                        key: history[-1]
+                        for key, history in system_history.items()
+                        if key != "timestamps"
+                    },
+                    "services": {
+                        key: {
+                            metric: history[-1]
+                            for metric, history in resource_history[key].items()
+                            if metric != "timestamps"
+                        }
+                        for key in sampled_scopes
+                        if key != "system" and key in registry.services
+                    },
+                }
+            for transition in transitions:
+                publish_event("alert", transition)
+
+            # Persist this tick for history exports
+            history_log.append(record)
 
             time.sleep(5)  # Monitor every 5 seconds
 
@@ -616,9 +1755,110 @@ def monitor_resources():
             time.sleep(5)
 
 
-# Start monitoring thread
+def apply_registry(new_registry):
+    """Swap in a new service registry, dropping monitoring state of removed services.
+
+    History and aggregates of services that are still configured are kept.
+    """
+    global registry
+    with resource_lock:
+        for state in (resource_history, service_aggregates, pressure_state["services"]):
+            for key in set(state) - set(new_registry.services):
+                del state[key]
+        registry = new_registry
+
+
+def find_services_config():
+    """Get the path of the service configuration file in use, None if there is none"""
+    for name in SERVICES_CONFIG_NAMES:
+        path = os.path.join(SERVICES_CONFIG_DIR, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def reload_services():
+    """Reload the service registry from its config file, keeping the current one on error"""
+    global services_config_data
+    path = find_services_config()
+    if path is None:
+        logger.warning(f"No service configuration in {SERVICES_CONFIG_DIR}, keeping current services")
+        return
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if (path, data) == services_config_data:
+            return
+        new_registry = load_services_config(path)
+    except FileNotFoundError:
+        logger.warning(f"{path} not found, keeping current services")
+        return
+    except Exception as e:
+        logger.error(f"Failed to load {path}, keeping current services: {e}")
+        return
+
+    apply_registry(new_registry)
+    services_config_data = (path, data)
+    logger.info(f"Loaded services from {path}: {', '.join(new_registry.services)}")
+
+
+# inotify event flags (see inotify(7))
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+
+def inotify_events(directory, mask):
+    """Yield names of files in a directory as inotify reports events for them"""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    fd = libc.inotify_init1(os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    try:
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        header = struct.Struct("iIII")
+        while True:
+            data = os.read(fd, 4096)
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = header.unpack_from(data, offset)
+                offset += header.size
+                yield os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+    finally:
+        os.close(fd)
+
+
+def watch_services_config():
+    """Background thread reloading the service registry when its config file changes"""
+    try:
+        # Watch the directory so that editors which save by renaming are caught
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for name in inotify_events(SERVICES_CONFIG_DIR, mask):
+            if name in SERVICES_CONFIG_NAMES:
+                time.sleep(CONFIG_RELOAD_DELAY)
+                reload_services()
+    except (OSError, AttributeError, TypeError) as e:
+        logger.info(f"inotify unavailable ({e}), polling {SERVICES_CONFIG_DIR} for changes")
+
+    while True:
+        time.sleep(CONFIG_POLL_INTERVAL)
+        if find_services_config():
+            reload_services()
+
+
+# Load services, falling back to the built-in defaults without a config file
+registry = ServiceRegistry(DEFAULT_SERVICES)
+services_config_data = None
+if find_services_config():
+    reload_services()
+
+# Start monitoring and config watcher threads
 monitor_thread = Thread(target=monitor_resources, daemon=True)
 monitor_thread.start()
+config_thread = Thread(target=watch_services_config, daemon=True)
+config_thread.start()
 
 
 @app.route("/")
@@ -630,13 +1870,15 @@ def index():
 @app.route("/api/services/status")
 def get_all_service_status():
     """Get status of all configured services"""
+    current = registry
+    states = get_units_state(current.units)
     status = {}
-    for key, service in SERVICES.items():
+    for key, service in current.services.items():
         status[key] = {
             "name": service["name"],
-            "active": get_service_status(service["systemd_unit"]),
+            "active": states[service["systemd_unit"]]["active"],
             "systemd_unit": service["systemd_unit"],
-            "port": service["port"],
+            "port": service.get("port"),
         }
     return jsonify(status)
 
@@ -644,34 +1886,34 @@ def get_all_service_status():
 @app.route("/api/services/<service>/start", methods=["POST"])
 def start_service(service):
     """Start a specific service"""
-    if service not in SERVICES:
+    current = registry
+    service_config = current.services.get(service)
+    if service_config is None:
         return jsonify({"error": "Service not found"}), 404
 
-    service_config = SERVICES[service]
-    
     # Stop mutually exclusive services first
-    if "mutually_exclusive_with" in service_config:
-        for exclusive_service in service_config["mutually_exclusive_with"]:
-            if exclusive_service in SERVICES:
-                exclusive_config = SERVICES[exclusive_service]
-                logger.info(f"Stopping mutually exclusive service: {exclusive_service}")
-                stop_success, stop_error = run_systemctl("stop", exclusive_config["systemd_unit"])
-                if stop_success:
-                    # Disable nginx proxy for the stopped service
-                    nginx_success, nginx_error = toggle_nginx_site(exclusive_config["nginx_config"], enable=False)
-                    if not nginx_success:
-                        logger.warning(f"Stopped {exclusive_service} but nginx toggle failed: {nginx_error}")
-                else:
-                    logger.warning(f"Failed to stop {exclusive_service}: {stop_error}")
+    for exclusive_service in current.exclusive_with[service]:
+        exclusive_config = current.services[exclusive_service]
+        logger.info(f"Stopping mutually exclusive service: {exclusive_service}")
+        stop_success, stop_error = run_systemctl("stop", exclusive_config["systemd_unit"])
+        if stop_success:
+            # Disable nginx proxy for the stopped service
+            if exclusive_config.get("nginx_config"):
+                nginx_success, nginx_error = toggle_nginx_site(exclusive_config["nginx_config"], enable=False)
+                if not nginx_success:
+                    logger.warning(f"Stopped {exclusive_service} but nginx toggle failed: {nginx_error}")
+        else:
+            logger.warning(f"Failed to stop {exclusive_service}: {stop_error}")
     
     # Start the requested service
     success, error = run_systemctl("start", service_config["systemd_unit"])
 
     if success:
         # Enable nginx proxy for this service
-        nginx_success, nginx_error = toggle_nginx_site(service_config["nginx_config"], enable=True)
-        if not nginx_success:
-            logger.warning(f"Service started but nginx toggle failed: {nginx_error}")
+        if service_config.get("nginx_config"):
+            nginx_success, nginx_error = toggle_nginx_site(service_config["nginx_config"], enable=True)
+            if not nginx_success:
+                logger.warning(f"Service started but nginx toggle failed: {nginx_error}")
         return jsonify({"status": "started", "service": service})
     else:
         return jsonify({"error": error}), 500
@@ -680,17 +1922,18 @@ def start_service(service):
 @app.route("/api/services/<service>/stop", methods=["POST"])
 def stop_service(service):
     """Stop a specific service"""
-    if service not in SERVICES:
+    service_config = registry.services.get(service)
+    if service_config is None:
         return jsonify({"error": "Service not found"}), 404
 
-    service_config = SERVICES[service]
     success, error = run_systemctl("stop", service_config["systemd_unit"])
 
     if success:
         # Disable nginx proxy for this service
-        nginx_success, nginx_error = toggle_nginx_site(service_config["nginx_config"], enable=False)
-        if not nginx_success:
-            logger.warning(f"Service stopped but nginx toggle failed: {nginx_error}")
+        if service_config.get("nginx_config"):
+            nginx_success, nginx_error = toggle_nginx_site(service_config["nginx_config"], enable=False)
+            if not nginx_success:
+                logger.warning(f"Service stopped but nginx toggle failed: {nginx_error}")
         return jsonify({"status": "stopped", "service": service})
     else:
         return jsonify({"error": error}), 500
@@ -699,10 +1942,10 @@ def stop_service(service):
 @app.route("/api/services/<service>/restart", methods=["POST"])
 def restart_service(service):
     """Restart a specific service"""
-    if service not in SERVICES:
+    service_config = registry.services.get(service)
+    if service_config is None:
         return jsonify({"error": "Service not found"}), 404
 
-    service_config = SERVICES[service]
     success, error = run_systemctl("restart", service_config["systemd_unit"])
 
     if success:
@@ -714,69 +1957,91 @@ def restart_service(service):
 @app.route("/api/services/<service>/status")
 def get_service_status_api(service):
     """Get status of a specific service"""
-    if service not in SERVICES:
+    service_config = registry.services.get(service)
+    if service_config is None:
         return jsonify({"error": "Service not found"}), 404
 
-    service_config = SERVICES[service]
-    active = get_service_status(service_config["systemd_unit"])
+    unit = service_config["systemd_unit"]
+    active = get_units_state([unit])[unit]["active"]
 
     return jsonify(
         {
             "service": service,
             "name": service_config["name"],
             "active": active,
-            "port": service_config["port"],
+            "port": service_config.get("port"),
         }
     )
 
 
 @app.route("/api/resources/stats")
 def get_resource_stats():
-    """Get current resource statistics for system and services"""
+    """Get current resource statistics for system and services.
+
+    With ``?since=<timestamp>`` only history samples newer than it are returned.
+    History only covers ticks up to ``as_of``, so samples of a tick that is
+    still being recorded are not skipped by the next ``since`` request.
+    """
     stats = {"system": {}, "services": {}}
+    since = request.args.get("since", type=float)
 
     # Get current system resources
     sys_resources = get_system_resources()
 
-    # Calculate network rates (per second)
+    # Latest per-second I/O rates from the monitoring thread
     with resource_lock:
-        if len(system_history["network_sent"]) >= 2:
-            net_sent_rate = system_history["network_sent"][-1]
-            net_recv_rate = system_history["network_recv"][-1]
-        else:
-            net_sent_rate = 0
-            net_recv_rate = 0
-
-    stats["system"] = {
-        "cpu": sys_resources["cpu"],
-        "memory": sys_resources["memory"],
-        "disk": sys_resources["disk"],
-        "network": {"bytes_sent": net_sent_rate, "bytes_recv": net_recv_rate},
-        "history": {
-            "cpu": list(system_history["cpu"]),
-            "memory": list(system_history["memory"]),
-            "disk": list(system_history["disk"]),
-            "network_sent": list(system_history["network_sent"]),
-            "network_recv": list(system_history["network_recv"]),
-            "timestamps": list(system_history["timestamps"]),
-        },
-    }
+        as_of = last_complete_tick
+        stats["as_of"] = as_of
+        latest = {
+            key: history[-1] if history else None
+            for key, history in system_history.items()
+        }
+        interface_rates = io_rates["interfaces"]
+        disk_device_rates = io_rates["disks"]
+        fill_rate_slow = io_rates["data_fill_rate_slow"]
+
+        # Project time until the data mount is full from the long-term fill rate
+        data_mount = dict(sys_resources["data_mount"])
+        data_mount["fill_rate"] = io_rates["data_fill_rate"]
+        data_mount["fill_rate_slow"] = fill_rate_slow
+        data_mount["time_to_full"] = None
+        if fill_rate_slow and fill_rate_slow > 0:
+            data_mount["time_to_full"] = data_mount["free"] / fill_rate_slow
+
+        stats["system"] = {
+            "cpu": sys_resources["cpu"],
+            "memory": sys_resources["memory"],
+            "disk": sys_resources["disk"],
+            "data_mount": data_mount,
+            "network": {
+                "bytes_sent": latest["network_sent"] or 0,
+                "bytes_recv": latest["network_recv"] or 0,
+                "interfaces": interface_rates,
+            },
+            "disk_io": {
+                "read_bytes": latest["disk_read"] or 0,
+                "write_bytes": latest["disk_write"] or 0,
+                "disks": disk_device_rates,
+            },
+            "pressure": pressure_state["system"],
+            "history": history_since(system_history, since, as_of),
+            "aggregates": get_aggregate_snapshot("system"),
+        }
 
     # Get service-specific resources
-    for service_key, service_config in SERVICES.items():
-        if get_service_status(service_config["systemd_unit"]):
-            pid = get_service_pid(service_config["systemd_unit"])
+    current = registry
+    states = get_units_state(current.units)
+    for service_key, service_config in current.services.items():
+        state = states[service_config["systemd_unit"]]
+        if state["active"]:
+            pid = state["pid"]
             if pid:
                 resources = get_process_resources(pid)
                 if resources:
                     with resource_lock:
-                        history_data = {
-                            "cpu": list(resource_history[service_key]["cpu"]),
-                            "memory": list(resource_history[service_key]["memory"]),
-                            "timestamps": list(
-                                resource_history[service_key]["timestamps"]
-                            ),
-                        }
+                        history_data = history_since(resource_history[service_key], since, as_of)
+                        aggregates = get_aggregate_snapshot(service_key)
+                        pressure = pressure_state["services"].get(service_key, {})
 
                     stats["services"][service_key] = {
                         "pid": pid,
@@ -784,11 +2049,143 @@ def get_resource_stats():
                         "memory": resources["memory"],
                         "memory_percent": resources["memory_percent"],
                         "num_processes": resources["num_processes"],
+                        "pressure": pressure,
                         "history": history_data,
+                        "aggregates": aggregates,
                     }
 
     return jsonify(stats)
 
 
+@app.route("/api/resources/aggregates")
+def get_resource_aggregates():
+    """Get rolling aggregates for the system and every sampled service"""
+    with resource_lock:
+        aggregates = {
+            "system": get_aggregate_snapshot("system"),
+            "services": {
+                key: get_aggregate_snapshot(key) for key in service_aggregates
+            },
+        }
+    return jsonify(aggregates)
+
+
+@app.route("/api/resources/export")
+def export_resource_history():
+    """Stream resource history as CSV or NDJSON, optionally downsampled.
+
+    Query parameters: start/end (unix seconds), metrics and services
+    (comma-separated, "system" selects system-wide metrics), format
+    (csv or ndjson), points (target points per series) and method
+    (lttb or minmax).
+    """
+    now = time.time()
+    try:
+        end = float(request.args.get("end", now))
+        start = float(request.args.get("start", end - EXPORT_DEFAULT_RANGE))
+    except ValueError:
+        start = end = math.nan
+    if not (math.isfinite(start) and math.isfinite(end)):
+        return jsonify({"error": "start and end must be unix timestamps"}), 400
+    if start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+    # Nothing older than the retention window or newer than now is on disk
+    end = min(end, now)
+    start = min(max(start, now - HISTORY_RETENTION_DAYS * 86400), end)
+
+    points = request.args.get("points")
+    if points is not None:
+        try:
+            points = int(points)
+            valid = EXPORT_MIN_POINTS <= points <= EXPORT_MAX_POINTS
+        except ValueError:
+            valid = False
+        if not valid:
+            return jsonify(
+                {"error": f"points must be between {EXPORT_MIN_POINTS} and {EXPORT_MAX_POINTS}"}
+            ), 400
+
+    export_format = request.args.get("format", "csv")
+    if export_format not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+    method = request.args.get("method", "lttb")
+    if method not in DOWNSAMPLERS:
+        return jsonify({"error": f"method must be one of {', '.join(DOWNSAMPLERS)}"}), 400
+
+    metrics = set(filter(None, request.args.get("metrics", "").split(","))) or None
+    scopes = set(filter(None, request.args.get("services", "").split(","))) or None
+    rows = export_history(start, end, scopes, metrics, points, method)
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["timestamp", "service", "metric", "value"])
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_ndjson():
+        for timestamp, scope, metric, value in rows:
+            yield json.dumps(
+                {"timestamp": timestamp, "service": scope, "metric": metric, "value": value}
+            ) + "\n"
+
+    if export_format == "csv":
+        generate, mimetype = generate_csv, "text/csv"
+    else:
+        generate, mimetype = generate_ndjson, "application/x-ndjson"
+    filename = f"openhsi-resources-{int(start)}-{int(end)}.{export_format}"
+    return Response(
+        generate(),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.route("/api/alerts")
+def get_alerts():
+    """Get active alerts and the state of every alert rule"""
+    with resource_lock:
+        active = get_active_alerts()
+        rules = {name: dict(state) for name, state in alert_state.items()}
+    return jsonify({"active": active, "rules": rules})
+
+
+@app.route("/api/events")
+def event_stream():
+    """Stream alert transitions to the client as server-sent events"""
+    subscriber = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    with event_lock:
+        event_subscribers.add(subscriber)
+    with resource_lock:
+        active = get_active_alerts()
+
+    def generate():
+        try:
+            yield f"event: alerts\ndata: {json.dumps(active)}\n\n"
+            while True:
+                try:
+                    message = subscriber.get(timeout=EVENT_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            with event_lock:
+                event_subscribers.discard(subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5001, debug=False)
@@ -75,7 +75,7 @@ CONDA_BIN="$CONDA_BASE/bin/conda"
 # Check if conda environments already exist
 if ! $CONDA_BIN env list | grep -q "openhsi-switcher"; then
     echo -e "${YELLOW}Creating openhsi-switcher conda environment...${NC}"
-    $CONDA_BIN create -y -n openhsi-switcher python=3.10 flask psutil
+    $CONDA_BIN create -y -n openhsi-switcher python=3.10 flask psutil tomli
 fi
 
 if ! $CONDA_BIN env list | grep -q "openhsi"; then
@@ -86,6 +86,10 @@ fi
 # Copy controller script
 echo -e "${YELLOW}Installing controller script...${NC}"
 cp openhsi-switcher.py /opt/openhsi/controller/
+# Keep an existing service configuration, it may have been customised
+if [[ ! -f /opt/openhsi/controller/services.toml ]]; then
+    cp templates/services.toml /opt/openhsi/controller/services.toml
+fi
 chown -R openhsi:openhsi /opt/openhsi
 
 # Install systemd service